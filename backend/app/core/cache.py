@@ -0,0 +1,31 @@
+"""
+In-process caching helpers
+"""
+
+import functools
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+
+def async_ttl_cache(maxsize: int = 32, ttl: int = 300, key=hashkey):
+    """Memoize an async function's result for ttl seconds (see cache_clear)"""
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+
+            result = await func(*args, **kwargs)
+            cache[cache_key] = result
+            return result
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
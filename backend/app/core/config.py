@@ -1,6 +1,6 @@
 from pydantic import BaseSettings, validator
 
-from typing import List
+from typing import List, Optional, Union
 
 class Settings(BaseSettings):
     """Application settings for LegalEase AI"""
@@ -13,6 +13,7 @@ class Settings(BaseSettings):
 
     # API
     API_V1_STR: str = "/api/v1"
+    THREADPOOL_SIZE: int = 100  # worker threads for sync endpoints
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -28,6 +29,24 @@ class Settings(BaseSettings):
     # Database
     MONGODB_URL: str
     DATABASE_NAME: str
+    MONGODB_WRITE_CONCERN: Optional[Union[int, str]] = None  # e.g. 1 or "majority"; server default when unset
+    MONGODB_JOURNAL: Optional[bool] = None
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGODB_MAX_POOL_SIZE: int = 100  # pymongo default
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = 30000
+    MONGODB_MAX_IDLE_TIME_MS: int = 1800000  # recycle idle sockets after 30 min
+    MONGODB_HEARTBEAT_FREQUENCY_MS: int = 10000
+    MONGODB_POOL_WARM: int = 10  # connections opened at startup
+    DB_ECHO: bool = False  # log every MongoDB command (debugging only)
+
+    # Caching
+    DATASET_CACHE_TTL: int = 300  # seconds
+    CONTRACT_CACHE_TTL: int = 60  # seconds
+
+    # Dataset
+    PERSIST_SAMPLE_CSV: bool = False  # also write the sample dataset to data/
+    DATASET_DOWNLOAD_URL: Optional[str] = None  # direct link to the dataset ZIP
 
     # AI APIs
     GEMINI_API_KEY: str
@@ -4,14 +4,31 @@ MongoDB database configuration and connection
 
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel, WriteConcern, monitoring
 from app.core.config import settings
 from app.models.mongodb_models import (
     Contract, ContractAnalysis, ContractClause, 
     Clause, User, AnalysisSession
 )
 import asyncio
+import logging
 from typing import AsyncGenerator
 
+# Driver command logging is opt-in; keep it off the hot path otherwise
+logging.getLogger("pymongo").setLevel(logging.DEBUG if settings.DB_ECHO else logging.WARNING)
+
+class _CommandLogger(monitoring.CommandListener):
+    """Log MongoDB commands; only registered when DB_ECHO is enabled"""
+
+    def started(self, event):
+        print(f"🔍 MongoDB {event.command_name} {event.command}")
+
+    def succeeded(self, event):
+        print(f"🔍 MongoDB {event.command_name} succeeded in {event.duration_micros}us")
+
+    def failed(self, event):
+        print(f"⚠️ MongoDB {event.command_name} failed: {event.failure}")
+
 # MongoDB client
 client: AsyncIOMotorClient = None
 database = None
@@ -22,8 +39,26 @@ async def init_db():
     
     try:
         # Create MongoDB client
-        client = AsyncIOMotorClient(settings.MONGODB_URL)
-        database = client[settings.DATABASE_NAME]
+        client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            heartbeatFrequencyMS=settings.MONGODB_HEARTBEAT_FREQUENCY_MS,
+            # Read datetimes back as aware UTC, matching what the services write
+            tz_aware=True,
+            event_listeners=[_CommandLogger()] if settings.DB_ECHO else [],
+        )
+        # Keep the server's default write concern unless one is configured
+        write_concern = None
+        if settings.MONGODB_WRITE_CONCERN is not None or settings.MONGODB_JOURNAL is not None:
+            write_concern = WriteConcern(
+                w=settings.MONGODB_WRITE_CONCERN,
+                j=settings.MONGODB_JOURNAL,
+            )
+        database = client.get_database(settings.DATABASE_NAME, write_concern=write_concern)
         
         # Initialize Beanie with all document models
         await init_beanie(
@@ -38,6 +73,8 @@ async def init_db():
             ]
         )
         
+        await ensure_indexes()
+
         print("✅ MongoDB database initialized successfully")
         return True
         
@@ -45,6 +82,45 @@ async def init_db():
         print(f"❌ MongoDB initialization failed: {e}")
         return False
 
+async def ensure_indexes():
+    """Create the query indexes, logging and skipping any the server rejects"""
+    indexes = {
+        Clause: [
+            IndexModel(
+                [("source_dataset", ASCENDING), ("clause_type", ASCENDING), ("risk_level", ASCENDING)],
+                name="ix_clause_src_type_risk"
+            ),
+            # Risk-level filters skip clause_type, so they need their own prefix
+            IndexModel(
+                [("source_dataset", ASCENDING), ("risk_level", ASCENDING)],
+                name="ix_clause_src_risk"
+            ),
+            # Inverted index backing the $text search in search_clauses
+            IndexModel(
+                [("text", TEXT)],
+                default_language="english",
+                name="ix_clause_text_search"
+            ),
+        ],
+        ContractClause: [
+            IndexModel([("contract_id", ASCENDING)], name="ix_clause_contract"),
+        ],
+        ContractAnalysis: [
+            IndexModel(
+                [("contract_id", ASCENDING), ("analysis_date", DESCENDING)],
+                name="ix_analysis_contract_date"
+            ),
+        ],
+    }
+
+    for model, model_indexes in indexes.items():
+        collection = model.get_motor_collection()
+        for index in model_indexes:
+            try:
+                await collection.create_indexes([index])
+            except Exception as e:
+                print(f"⚠️ Skipped index {index.document['name']}: {e}")
+
 async def get_database():
     """Get database instance"""
     if database is None:
@@ -57,15 +133,34 @@ async def close_db():
         client.close()
         print("✅ MongoDB connection closed")
 
+async def _ping():
+    """Round-trip a ping over a pooled connection"""
+    await client.admin.command('ping')
+
+async def warm_connection_pool(n: int = settings.MONGODB_POOL_WARM):
+    """Run up to n concurrent pings so the pool opens connections before traffic"""
+    # A maxPoolSize of 0 means an unbounded pool
+    n = min(n, settings.MONGODB_MAX_POOL_SIZE or n)
+    if client is None or n <= 0:
+        return
+
+    try:
+        # The driver opens only a few connections at a time and reuses freed
+        # ones, so this is best effort; MONGODB_MIN_POOL_SIZE keeps a fixed floor
+        await asyncio.gather(*[_ping() for _ in range(n)])
+        print("✅ MongoDB connection pool warmed")
+    except Exception as e:
+        print(f"⚠️ MongoDB pool warm-up failed: {e}")
+
 async def check_db_connection():
     """Check if MongoDB is accessible"""
     try:
         if client is None:
             await init_db()
         
-        # Test database connection
-        await client.admin.command('ping')
-        print("✅ MongoDB connection verified")
+        # Test database connection; callers report success themselves, since
+        # the detailed health check runs this on every request
+        await _ping()
         return True
         
     except Exception as e:
@@ -16,6 +16,7 @@ import time
 from app.core.config import settings
 from app.core.database import init_db, check_db_connection, close_db, get_database
 from routes import upload, analysis, health, dataset
+from services.dataset_loader import dataset_load_lock, dataset_ready
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
     max_age=3600,  # Cache preflight for 1 hour
 )
 
@@ -173,22 +175,25 @@ async def load_dataset_background():
     Enhanced dataset loading with better error handling
     """
     try:
-        logger.info("Loading Kaggle Contracts Clauses Dataset...")
-        db = await get_database()
-        from services.dataset_loader import DatasetLoaderService
+        async with dataset_load_lock:
+            logger.info("Loading Kaggle Contracts Clauses Dataset...")
+            db = await get_database()
+            from services.dataset_loader import DatasetLoaderService
 
-        loader = DatasetLoaderService(db)
-        success = await loader.load_dataset_to_db()
+            loader = DatasetLoaderService(db)
+            success = await loader.load_dataset_to_db()
 
-        if success:
-            count = await loader.get_clauses_count()
-            logger.info(f"✅ Dataset loaded successfully! ({count} clauses)")
-        else:
-            logger.warning("⚠️ Dataset loading failed, but server will continue")
+            if success:
+                count = await loader.get_clauses_count()
+                logger.info(f"✅ Dataset loaded successfully! ({count} clauses)")
+            else:
+                logger.warning("⚠️ Dataset loading failed, but server will continue")
 
     except Exception as e:
         logger.error(f"Dataset loading error: {e}")
         logger.info("Server will continue without dataset")
+    finally:
+        dataset_ready.set()
 
 @app.on_event("startup")
 async def enhanced_startup_event():
@@ -209,6 +214,8 @@ async def enhanced_startup_event():
                 logger.error("Database initialization failed")
                 if attempt == max_retries - 1:
                     logger.critical("Failed to initialize database after all retries")
+                    # No load will run, so don't hold dataset routes at 503 for one
+                    dataset_ready.set()
                     return
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 continue
@@ -220,6 +227,7 @@ async def enhanced_startup_event():
             logger.error(f"Database initialization failed: {e}")
             if attempt == max_retries - 1:
                 logger.critical("Failed to initialize database after all retries")
+                dataset_ready.set()
                 return
             await asyncio.sleep(2 ** attempt)
 
@@ -227,6 +235,7 @@ async def enhanced_startup_event():
     logger.info("Verifying database connection...")
     if not await check_db_connection():
         logger.error("Database connection verification failed")
+        dataset_ready.set()
         return
 
     logger.info("✅ Database connection verified")
@@ -5,21 +5,26 @@ LegalEase AI - FastAPI Backend Main Application
 import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
+from anyio import to_thread
 from concurrent.futures import ThreadPoolExecutor
 
 from app.core.config import settings
-from app.core.database import init_db, check_db_connection, close_db, get_database
+from app.core.database import (
+    init_db, check_db_connection, close_db, get_database, warm_connection_pool
+)
 from routes import upload, analysis, health, dataset
-from services.dataset_loader import DatasetLoaderService
+from services.dataset_loader import DatasetLoaderService, dataset_load_lock, dataset_ready
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.APP_VERSION,
     description="AI-powered contract analysis and legal document understanding",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Set up CORS
@@ -29,8 +34,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Compress larger JSON payloads such as clause listings
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include API routers
 app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(upload.router, prefix="/api/v1/contracts", tags=["contracts"])
@@ -53,43 +62,56 @@ async def load_dataset_background():
     Load Kaggle Contracts Clauses Dataset in background (async-safe).
     """
     try:
-        db = await get_database()
-        loader = DatasetLoaderService(db)
+        async with dataset_load_lock:
+            db = await get_database()
+            loader = DatasetLoaderService(db)
 
-        # Await the async loader method properly
-        success = await loader.load_dataset_to_db()
-        if success:
-            count = await loader.get_clauses_count()
-            print(f"✅ Dataset loaded successfully! ({count} clauses)")
-        else:
-            print("⚠️ Dataset loading failed, but server will continue")
+            # Await the async loader method properly
+            success = await loader.load_dataset_to_db()
+            if success:
+                count = await loader.get_clauses_count()
+                print(f"✅ Dataset loaded successfully! ({count} clauses)")
+            else:
+                print("⚠️ Dataset loading failed, but server will continue")
 
     except Exception as e:
         print(f"⚠️ Dataset loading error: {e}")
         print("Server will continue without dataset")
+    finally:
+        dataset_ready.set()
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and load dataset on startup"""
     print("🚀 Starting LegalEase AI Backend...")
 
+    # Widen the threadpool used for sync endpoints and UploadFile I/O
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
     # Initialize MongoDB database
     try:
         success = await init_db()
         if not success:
             print("❌ Database initialization failed")
+            # No load will run, so don't hold dataset routes at 503 for one
+            dataset_ready.set()
             return
         print("✅ MongoDB database initialized successfully")
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
+        dataset_ready.set()
         return
 
     # Check database connection
     if not await check_db_connection():
         print("❌ Database connection failed")
+        dataset_ready.set()
         return
     print("✅ Database connection verified")
 
+    # Pre-open pooled connections before traffic arrives
+    await warm_connection_pool()
+
     # Start dataset loading in background
     print("📊 Loading Kaggle Contracts Clauses Dataset in background...")
     asyncio.create_task(load_dataset_background())
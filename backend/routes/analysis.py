@@ -16,6 +16,44 @@ from services.advanced_gemini_service import AdvancedGeminiDocumentService
 
 router = APIRouter()
 
+# Static reference data, built at import
+_RISK_LEVELS_RESPONSE = RiskLevelsResponse(
+    risk_levels={
+        "high": {
+            "description": "High risk clauses that require immediate attention",
+            "color": "#ef4444",
+            "examples": ["Unlimited liability", "Broad IP assignment", "Restrictive non-compete"]
+        },
+        "medium": {
+            "description": "Moderate risk clauses that should be reviewed",
+            "color": "#f59e0b",
+            "examples": ["Confidentiality obligations", "Termination conditions", "Payment terms"]
+        },
+        "low": {
+            "description": "Low risk clauses that are generally acceptable",
+            "color": "#10b981",
+            "examples": ["Standard definitions", "Governing law", "Basic obligations"]
+        }
+    }
+)
+
+_CLAUSE_TYPES_RESPONSE = ClauseTypesResponse(
+    clause_types=[
+        "confidentiality",
+        "intellectual_property",
+        "liability",
+        "termination",
+        "payment",
+        "non_compete",
+        "indemnification",
+        "governing_law",
+        "dispute_resolution",
+        "force_majeure",
+        "assignment",
+        "amendment"
+    ]
+)
+
 @router.post("/analyze", response_model=ContractAnalysisResponse)
 async def analyze_contract(
     request: AnalysisRequest,
@@ -91,45 +129,12 @@ async def compare_clauses(
 @router.get("/risk-levels", response_model=RiskLevelsResponse)
 async def get_risk_levels():
     """Get available risk levels and their descriptions"""
-    return RiskLevelsResponse(
-        risk_levels={
-            "high": {
-                "description": "High risk clauses that require immediate attention",
-                "color": "#ef4444",
-                "examples": ["Unlimited liability", "Broad IP assignment", "Restrictive non-compete"]
-            },
-            "medium": {
-                "description": "Moderate risk clauses that should be reviewed",
-                "color": "#f59e0b",
-                "examples": ["Confidentiality obligations", "Termination conditions", "Payment terms"]
-            },
-            "low": {
-                "description": "Low risk clauses that are generally acceptable",
-                "color": "#10b981",
-                "examples": ["Standard definitions", "Governing law", "Basic obligations"]
-            }
-        }
-    )
+    return _RISK_LEVELS_RESPONSE
 
 @router.get("/clause-types", response_model=ClauseTypesResponse)
 async def get_clause_types():
     """Get available clause types for classification"""
-    return ClauseTypesResponse(
-        clause_types=[
-            "confidentiality",
-            "intellectual_property",
-            "liability",
-            "termination",
-            "payment",
-            "non_compete",
-            "indemnification",
-            "governing_law",
-            "dispute_resolution",
-            "force_majeure",
-            "assignment",
-            "amendment"
-        ]
-    )
+    return _CLAUSE_TYPES_RESPONSE
 
 @router.get("/contract/{contract_id}/analysis")
 async def get_contract_analysis(
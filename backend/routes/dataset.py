@@ -2,28 +2,51 @@
 Dataset endpoints for querying Kaggle Contracts Clauses Dataset
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import Any, Dict, List, Optional
 
+from app.core.cache import async_ttl_cache
+from app.core.config import settings
+from app.core.database import get_database
 from app.models.database import Clause
 from app.models.schemas import ClauseResponse, ClauseListResponse
-from services.dataset_loader import DatasetLoaderService
+from services.dataset_loader import DatasetLoaderService, dataset_load_lock, dataset_ready
 from beanie import PydanticObjectId
+from bson import ObjectId
+
+
+async def require_dataset_ready():
+    """Reject dataset queries while the dataset is still being loaded"""
+    if not dataset_ready.is_set():
+        raise HTTPException(
+            status_code=503,
+            detail="Dataset is still loading, please retry shortly"
+        )
+
+
+async def get_loader(db = Depends(get_database)) -> DatasetLoaderService:
+    """Provide a dataset loader bound to the request's database handle"""
+    return DatasetLoaderService(db)
+
 
 router = APIRouter()
 
-@router.get("/clauses", response_model=ClauseListResponse)
+@router.get("/clauses", response_model=ClauseListResponse, dependencies=[Depends(require_dataset_ready)])
 async def get_clauses(
+    response: Response,
     clause_type: Optional[str] = Query(None, description="Filter by clause type"),
     risk_level: Optional[str] = Query(None, description="Filter by risk level"),
     search_text: Optional[str] = Query(None, description="Search in clause text"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (ignored with after_id)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    after_id: Optional[str] = Query(None, description="Return clauses after this ID (keyset pagination)"),
+    loader: DatasetLoaderService = Depends(get_loader),
 ):
     """Get clauses from the dataset with optional filtering"""
-    try:
-        loader = DatasetLoaderService()
+    if after_id and not ObjectId.is_valid(after_id):
+        raise HTTPException(status_code=422, detail="after_id must be a valid clause ID")
 
+    try:
         # Calculate offset
         offset = (page - 1) * page_size
 
@@ -33,15 +56,22 @@ async def get_clauses(
             clause_type=clause_type,
             risk_level=risk_level,
             skip=offset,
-            limit=page_size
+            limit=page_size,
+            after_id=after_id
         )
 
-        # Get total count for pagination
-        total_count = await loader.get_clauses_count()
+        # Get total count for pagination, using the same filters
+        total_count = await loader.count_clauses(
+            search_text=search_text,
+            clause_type=clause_type,
+            risk_level=risk_level
+        )
 
-        # Convert to response format
+        # Convert to response format. The documents were already validated when
+        # loaded, so skip per-field validation here; FastAPI still checks the
+        # response against response_model once
         clause_responses = [
-            ClauseResponse(
+            ClauseResponse.model_construct(
                 id=str(clause.id),
                 clause_type=clause.clause_type,
                 text=clause.text,
@@ -53,7 +83,11 @@ async def get_clauses(
             for clause in clauses
         ]
 
-        return ClauseListResponse(
+        # A full page hands out its last id as the after_id for the next one
+        if len(clauses) == page_size:
+            response.headers["X-Next-Cursor"] = str(clauses[-1].id)
+
+        return ClauseListResponse.model_construct(
             clauses=clause_responses,
             total_count=total_count,
             page=page,
@@ -67,7 +101,7 @@ async def get_clauses(
         )
 
 
-@router.get("/clauses/{clause_id}", response_model=ClauseResponse)
+@router.get("/clauses/{clause_id}", response_model=ClauseResponse, dependencies=[Depends(require_dataset_ready)])
 async def get_clause_by_id(clause_id: str):
     """Get a specific clause by ID"""
     try:
@@ -91,13 +125,62 @@ async def get_clause_by_id(clause_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to retrieve clause: {str(e)}")
 
 
-@router.get("/clauses/types/list")
+@async_ttl_cache(maxsize=1, ttl=settings.DATASET_CACHE_TTL)
+async def _clause_types() -> List[str]:
+    return await Clause.find(
+        {"source_dataset": "kaggle_contracts_clauses"}
+    ).distinct("clause_type")
+
+
+@async_ttl_cache(maxsize=1, ttl=settings.DATASET_CACHE_TTL)
+async def _risk_levels() -> List[str]:
+    return await Clause.find(
+        {"source_dataset": "kaggle_contracts_clauses", "risk_level": {"$ne": None}}
+    ).distinct("risk_level")
+
+
+@async_ttl_cache(maxsize=1, ttl=settings.DATASET_CACHE_TTL)
+async def _dataset_stats() -> Dict[str, Any]:
+    # One aggregation returns the total and both distributions together
+    pipeline = [
+        {"$match": {"source_dataset": "kaggle_contracts_clauses"}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "clause_types": [
+                {"$group": {"_id": "$clause_type", "count": {"$sum": 1}}}
+            ],
+            "risk_levels": [
+                {"$match": {"risk_level": {"$ne": None}}},
+                {"$group": {"_id": "$risk_level", "count": {"$sum": 1}}}
+            ]
+        }}
+    ]
+    result = (await Clause.aggregate(pipeline).to_list())[0]
+
+    total_clauses = result["total"][0]["count"] if result["total"] else 0
+    type_distribution = {item["_id"]: item["count"] for item in result["clause_types"]}
+    risk_distribution = {item["_id"]: item["count"] for item in result["risk_levels"]}
+
+    return {
+        "total_clauses": total_clauses,
+        "clause_type_distribution": type_distribution,
+        "risk_level_distribution": risk_distribution,
+        "dataset_source": "kaggle_contracts_clauses"
+    }
+
+
+def _clear_dataset_caches():
+    """Drop cached dataset lookups after the clauses collection changes"""
+    _clause_types.cache_clear()
+    _risk_levels.cache_clear()
+    _dataset_stats.cache_clear()
+
+
+@router.get("/clauses/types/list", dependencies=[Depends(require_dataset_ready)])
 async def get_clause_types():
     """Get list of available clause types"""
     try:
-        clause_types = await Clause.find(
-            {"source_dataset": "kaggle_contracts_clauses"}
-        ).distinct("clause_type")
+        clause_types = await _clause_types()
 
         return {"clause_types": clause_types, "total_types": len(clause_types)}
 
@@ -105,13 +188,11 @@ async def get_clause_types():
         raise HTTPException(status_code=500, detail=f"Failed to retrieve clause types: {str(e)}")
 
 
-@router.get("/clauses/risk-levels/list")
+@router.get("/clauses/risk-levels/list", dependencies=[Depends(require_dataset_ready)])
 async def get_risk_levels():
     """Get list of available risk levels"""
     try:
-        risk_levels = await Clause.find(
-            {"source_dataset": "kaggle_contracts_clauses", "risk_level": {"$ne": None}}
-        ).distinct("risk_level")
+        risk_levels = await _risk_levels()
 
         return {"risk_levels": risk_levels, "total_levels": len(risk_levels)}
 
@@ -119,55 +200,35 @@ async def get_risk_levels():
         raise HTTPException(status_code=500, detail=f"Failed to retrieve risk levels: {str(e)}")
 
 
-@router.get("/dataset/stats")
+@router.get("/dataset/stats", dependencies=[Depends(require_dataset_ready)])
 async def get_dataset_stats():
     """Get dataset statistics"""
     try:
-        loader = DatasetLoaderService()
-        total_clauses = await loader.get_clauses_count()
-
-        # Clause type distribution
-        clause_types = await Clause.find({"source_dataset": "kaggle_contracts_clauses"}).distinct("clause_type")
-        type_distribution = {}
-        for clause_type in clause_types:
-            count = await Clause.find(
-                {"clause_type": clause_type, "source_dataset": "kaggle_contracts_clauses"}
-            ).count()
-            type_distribution[clause_type] = count
-
-        # Risk level distribution
-        risk_levels = await Clause.find(
-            {"source_dataset": "kaggle_contracts_clauses", "risk_level": {"$ne": None}}
-        ).distinct("risk_level")
-        risk_distribution = {}
-        for risk_level in risk_levels:
-            count = await Clause.find(
-                {"risk_level": risk_level, "source_dataset": "kaggle_contracts_clauses"}
-            ).count()
-            risk_distribution[risk_level] = count
-
-        return {
-            "total_clauses": total_clauses,
-            "clause_type_distribution": type_distribution,
-            "risk_level_distribution": risk_distribution,
-            "dataset_source": "kaggle_contracts_clauses"
-        }
+        return await _dataset_stats()
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve dataset stats: {str(e)}")
 
 
 @router.post("/dataset/reload")
-async def reload_dataset():
+async def reload_dataset(loader: DatasetLoaderService = Depends(get_loader)):
     """Reload the dataset (admin endpoint)"""
-    try:
-        loader = DatasetLoaderService()
+    # A reload must not interleave with the startup load or another reload
+    if dataset_load_lock.locked():
+        raise HTTPException(status_code=409, detail="Dataset is already being loaded")
 
-        # Clear existing dataset
-        await Clause.find({"source_dataset": "kaggle_contracts_clauses"}).delete_many()
-
-        # Reload dataset
-        success = await loader.load_dataset_to_db()
+    try:
+        async with dataset_load_lock:
+            dataset_ready.clear()
+            try:
+                # Clear existing dataset
+                await loader.clear_dataset()
+
+                # Reload dataset; the collection was just emptied, so skip the check
+                success = await loader.load_dataset_to_db(force=True)
+            finally:
+                _clear_dataset_caches()
+                dataset_ready.set()
 
         if success:
             count = await loader.get_clauses_count()
@@ -175,5 +236,7 @@ async def reload_dataset():
         else:
             raise HTTPException(status_code=500, detail="Failed to reload dataset")
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to reload dataset: {str(e)}")
@@ -2,19 +2,22 @@
 Contract upload routes
 """
 
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from typing import List
 import aiofiles
 import os
 import uuid
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_database
 from app.models.schemas import ContractUploadResponse, ContractListResponse, ContractDetailResponse
-from services.contract_service import ContractService
+from services.contract_service import ContractService, FileTooLargeError
 
 router = APIRouter()
 
+_ALLOWED_FILE_TYPES = frozenset(ext.lower() for ext in settings.ALLOWED_FILE_TYPES)
+
 @router.post("/upload", response_model=ContractUploadResponse)
 async def upload_contract(
     file: UploadFile = File(...),
@@ -23,19 +26,19 @@ async def upload_contract(
     """Upload a contract file for analysis"""
     
     # Validate file type
-    file_extension = file.filename.split('.')[-1].lower()
-    allowed_types = ["pdf", "docx", "txt", "png", "jpg", "jpeg"]
-    if file_extension not in allowed_types:
+    file_extension = os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+    if file_extension not in _ALLOWED_FILE_TYPES:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type. Please upload: {', '.join(allowed_types)} files."
+            detail=f"Unsupported file type. Please upload: {', '.join(settings.ALLOWED_FILE_TYPES)} files."
         )
     
-    # Validate file size (10MB limit)
-    if file.size and file.size > 10 * 1024 * 1024:
+    # Reject early when the declared size is already over the limit; the
+    # service enforces the limit again on the bytes actually received
+    if file.size and file.size > settings.MAX_FILE_SIZE:
         raise HTTPException(
-            status_code=400,
-            detail="File too large. Maximum size is 10MB."
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE // (1024 * 1024)}MB."
         )
     
     try:
@@ -52,6 +55,8 @@ async def upload_contract(
             message="Contract uploaded successfully"
         )
     
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -60,15 +65,14 @@ async def upload_contract(
 
 @router.get("/list", response_model=ContractListResponse)
 async def list_contracts(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db = Depends(get_database)
 ):
     """List all uploaded contracts"""
     try:
         contract_service = ContractService(db)
-        contracts = await contract_service.get_contracts(skip=skip, limit=limit)
-        total_count = await contract_service.get_contracts_count()
+        contracts, total_count = await contract_service.get_contracts_page(skip=skip, limit=limit)
         
         return ContractListResponse(
             contracts=contracts,
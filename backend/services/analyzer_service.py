@@ -5,15 +5,26 @@ Enhanced contract analyzer service with Gemini AI integration
 from app.models.mongodb_models import Contract, ContractAnalysis, ContractClause
 from app.models.schemas import ClauseAnalysis
 from typing import List, Dict, Any, Optional
-from datetime import datetime
-import json
+from datetime import datetime, timezone
 import logging
 
 from services.advanced_gemini_service import AdvancedGeminiDocumentService
+from services.contract_service import invalidate_contract_cache
 from services.file_processing_service import FileProcessingService
 
 logger = logging.getLogger(__name__)
 
+# Fields returned per clause by get_contract_analysis
+_CLAUSE_PROJECTION = {
+    "_id": 0,
+    "clause_text": 1,
+    "clause_type": 1,
+    "risk_level": 1,
+    "risk_score": 1,
+    "simplified_explanation": 1,
+    "recommendations": 1
+}
+
 class AnalyzerService:
     def __init__(self, db):
         self.db = db
@@ -44,6 +55,7 @@ class AnalyzerService:
                 contract.extracted_text = extraction_result["text"]
                 contract.processed = True
                 await contract.save()
+                invalidate_contract_cache(contract_id)
 
             # Analyze with advanced Gemini AI using native PDF processing
             logger.info(f"Analyzing contract {contract_id} with advanced Gemini AI")
@@ -71,16 +83,15 @@ class AnalyzerService:
                 high_risk_clauses=analysis_result.get("risk_analysis", {}).get("risk_distribution", {}).get("high", 0),
                 medium_risk_clauses=analysis_result.get("risk_analysis", {}).get("risk_distribution", {}).get("medium", 0),
                 low_risk_clauses=analysis_result.get("risk_analysis", {}).get("risk_distribution", {}).get("low", 0),
-                analysis_date=datetime.utcnow(),
+                analysis_date=datetime.now(timezone.utc),
                 ai_model_used="gemini-1.5-flash"
             )
             
             await analysis.insert()
             
             # Create clause records
-            clauses_data = []
-            for clause_data in analysis_result.get("clauses", []):
-                clause = ContractClause(
+            clauses_data = [
+                ContractClause(
                     contract_id=contract_id,
                     clause_text=clause_data["clause_text"],
                     clause_type=clause_data["clause_type"],
@@ -91,8 +102,11 @@ class AnalyzerService:
                     start_position=clause_data.get("start_position", 0),
                     end_position=clause_data.get("end_position", 0)
                 )
-                await clause.insert()
-                clauses_data.append(clause)
+                for clause_data in analysis_result.get("clauses", [])
+            ]
+            
+            if clauses_data:
+                await ContractClause.insert_many(clauses_data)
             
             # Convert clauses to response format
             clause_responses = []
@@ -180,21 +194,10 @@ class AnalyzerService:
         if not analysis:
             return None
         
-        # Get clauses
-        clauses = await ContractClause.find(
-            ContractClause.contract_id == contract_id
-        ).to_list()
-        
-        clause_data = []
-        for clause in clauses:
-            clause_data.append({
-                "clause_text": clause.clause_text,
-                "clause_type": clause.clause_type,
-                "risk_level": clause.risk_level,
-                "risk_score": clause.risk_score,
-                "simplified_explanation": clause.simplified_explanation,
-                "recommendations": clause.recommendations
-            })
+        # Get clauses as raw projected documents, since they are returned as dicts
+        clause_data = await ContractClause.get_motor_collection().find(
+            {"contract_id": contract_id}, _CLAUSE_PROJECTION
+        ).to_list(length=None)
         
         return {
             "analysis_id": str(analysis.id),
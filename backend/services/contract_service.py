@@ -2,42 +2,120 @@
 Contract service for business logic
 """
 
+from app.core.config import settings
 from app.models.mongodb_models import Contract
-from typing import List, Dict, Any, Optional
-import aiofiles
+from beanie import PydanticObjectId
+from cachetools import TTLCache
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import os
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+UPLOAD_DIR = "uploads"
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Fields needed to build a contract list entry
+_CONTRACT_LIST_PROJECTION = {
+    "file_name": 1,
+    "file_size": 1,
+    "file_type": 1,
+    "uploaded_at": 1,
+    "processed": 1
+}
+
+class FileTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+def _copy_to_disk(src, path: str, max_size: int, expected_size: Optional[int] = None) -> int:
+    """Copy an upload to path in CHUNK_SIZE pieces, enforcing max_size"""
+    size = 0
+    with open(path, 'wb') as dst:
+        preallocated = False
+        # Reserve the known size up front so the file is laid out contiguously
+        if expected_size and expected_size <= max_size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(dst.fileno(), 0, expected_size)
+                preallocated = True
+            except OSError:
+                pass  # not supported by this filesystem; grow as we write
+        
+        while chunk := src.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                break
+            dst.write(chunk)
+        else:
+            if preallocated and size != expected_size:
+                dst.truncate(size)
+            if hasattr(os, "posix_fadvise"):
+                # Uploads are rarely read back soon; keep them out of the page cache
+                dst.flush()
+                os.posix_fadvise(dst.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            return size
+    
+    os.remove(path)
+    raise FileTooLargeError(
+        f"File too large. Maximum size is {max_size // (1024 * 1024)}MB."
+    )
+
+def _contract_list_entry(contract: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a projected contract document for the list response"""
+    return {
+        "id": str(contract["_id"]),
+        "filename": contract["file_name"],
+        "original_filename": contract["file_name"],
+        "file_size": contract["file_size"],
+        "file_type": contract["file_type"],
+        "upload_date": contract["uploaded_at"].isoformat(),
+        "processed": contract["processed"]
+    }
+
+# Recently fetched contracts by id. Entries also expire after a short TTL,
+# bounding staleness when several worker processes serve the API
+_contract_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.CONTRACT_CACHE_TTL)
+
+def invalidate_contract_cache(contract_id: str):
+    """Drop a contract from the cache after it changes"""
+    _contract_cache.pop(str(contract_id), None)
+
+def _remove_files(paths: List[str]):
+    """Unlink each path, treating an already-missing file as deleted"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not delete file {path}: {e}")
 
 class ContractService:
     def __init__(self, db):
         self.db = db
     
-    async def upload_contract(self, file) -> Dict[str, Any]:
+    async def upload_contract(self, file, max_size: int = settings.MAX_FILE_SIZE) -> Dict[str, Any]:
         """Upload and save contract file"""
         
-        # Create uploads directory
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-        
         # Generate unique filename
-        file_extension = file.filename.split('.')[-1].lower()
-        unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
+        file_extension = os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+        unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
+        file_path = os.path.join(UPLOAD_DIR, unique_filename)
         
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # Save file in a worker thread
+        file_size = await asyncio.to_thread(
+            _copy_to_disk, file.file, file_path, max_size, file.size
+        )
         
         # Create database record
         contract = Contract(
             title=file.filename,
             file_name=file.filename,
             file_path=file_path,
-            file_size=len(content),
+            file_size=file_size,
             file_type=file_extension,
-            uploaded_at=datetime.utcnow()
+            uploaded_at=datetime.now(timezone.utc)
         )
         
         await contract.insert()
@@ -52,20 +130,29 @@ class ContractService:
     
     async def get_contracts(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """Get list of contracts"""
-        contracts = await Contract.find().skip(skip).limit(limit).to_list()
+        # Fetch only the listed fields as raw documents
+        cursor = Contract.get_motor_collection().find(
+            {}, _CONTRACT_LIST_PROJECTION, skip=skip, limit=limit
+        )
+        contracts = await cursor.to_list(length=None)
         
-        return [
-            {
-                "id": str(contract.id),
-                "filename": contract.file_name,
-                "original_filename": contract.file_name,
-                "file_size": contract.file_size,
-                "file_type": contract.file_type,
-                "upload_date": contract.uploaded_at.isoformat(),
-                "processed": contract.processed
-            }
-            for contract in contracts
+        return [_contract_list_entry(contract) for contract in contracts]
+    
+    async def get_contracts_page(self, skip: int = 0, limit: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        """Get a page of contracts and the total count in one round trip"""
+        # $facet returns the whole page in one document (16 MB cap), so the
+        # page is always limited and only the listed fields enter the stage
+        pipeline = [
+            {"$project": _CONTRACT_LIST_PROJECTION},
+            {"$facet": {
+                "contracts": [{"$skip": skip}, {"$limit": limit}],
+                "total": [{"$count": "count"}]
+            }}
         ]
+        result = (await Contract.aggregate(pipeline).to_list())[0]
+        
+        total_count = result["total"][0]["count"] if result["total"] else 0
+        return [_contract_list_entry(contract) for contract in result["contracts"]], total_count
     
     async def get_contracts_count(self) -> int:
         """Get total count of contracts"""
@@ -73,37 +160,48 @@ class ContractService:
     
     async def get_contract_by_id(self, contract_id: str) -> Optional[Contract]:
         """Get contract by ID"""
-        return await Contract.get(contract_id)
+        contract = _contract_cache.get(contract_id)
+        if contract is None:
+            contract = await Contract.get(contract_id)
+            if contract is not None:
+                _contract_cache[contract_id] = contract
+        return contract
     
     async def delete_contract(self, contract_id: str) -> bool:
         """Delete contract and associated files"""
-        contract = await Contract.get(contract_id)
+        return await self.delete_contracts([contract_id]) > 0
+    
+    async def delete_contracts(self, contract_ids: List[str]) -> int:
+        """Delete several contracts and their files; returns how many existed"""
+        object_ids = [PydanticObjectId(contract_id) for contract_id in contract_ids]
+        collection = Contract.get_motor_collection()
         
-        if not contract:
-            return False
+        # Fetch only the file paths, in one query
+        contracts = await collection.find(
+            {"_id": {"$in": object_ids}}, {"file_path": 1}
+        ).to_list(length=None)
         
-        # Delete file from filesystem
-        try:
-            if os.path.exists(contract.file_path):
-                os.remove(contract.file_path)
-        except Exception as e:
-            print(f"Warning: Could not delete file {contract.file_path}: {e}")
+        if not contracts:
+            return 0
+        
+        # Delete files from filesystem, all in one worker thread
+        await asyncio.to_thread(_remove_files, [contract["file_path"] for contract in contracts])
         
         # Delete from database
-        await contract.delete()
+        await collection.delete_many({"_id": {"$in": [contract["_id"] for contract in contracts]}})
+        for contract in contracts:
+            invalidate_contract_cache(contract["_id"])
         
-        return True
+        return len(contracts)
     
     async def mark_contract_processed(self, contract_id: str, extracted_text: str = None) -> bool:
         """Mark contract as processed"""
-        contract = await Contract.get(contract_id)
-        
-        if not contract:
-            return False
-        
-        contract.processed = True
+        fields = {"processed": True}
         if extracted_text:
-            contract.extracted_text = extracted_text
+            fields["extracted_text"] = extracted_text
         
-        await contract.save()
-        return True
+        result = await Contract.get_motor_collection().update_one(
+            {"_id": PydanticObjectId(contract_id)}, {"$set": fields}
+        )
+        invalidate_contract_cache(contract_id)
+        return result.matched_count > 0
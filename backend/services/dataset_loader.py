@@ -2,28 +2,121 @@
 Dataset loader service for loading Kaggle dataset into MongoDB
 """
 
+import asyncio
 import pandas as pd
 import os
 import requests
+import shutil
 import zipfile
+from app.core.config import settings
 from app.models.mongodb_models import Clause
-from typing import List, Dict, Any
+from beanie import PydanticObjectId
+from pymongo import WriteConcern
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+DATASET_COLUMNS = ["clause_type", "text", "simplified_text", "risk_level"]
+REQUIRED_COLUMNS = ["clause_type", "text"]
+INSERT_BATCH_SIZE = 10_000
+# Batches inserted concurrently, each on its own pooled connection
+# (a maxPoolSize of 0 means an unbounded pool)
+INSERT_WORKERS = min(8, settings.MONGODB_MAX_POOL_SIZE or 8)
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Built-in sample used until the real Kaggle dataset is available
+_SAMPLE_CLAUSES = (
+    {
+        "clause_type": "confidentiality",
+        "text": "The Company shall maintain strict confidentiality regarding all proprietary information, trade secrets, and confidential data disclosed by the Client during the term of this Agreement.",
+        "simplified_text": "You must keep company information secret",
+        "risk_level": "medium"
+    },
+    {
+        "clause_type": "intellectual_property",
+        "text": "Employee agrees to assign all intellectual property rights, including but not limited to inventions, discoveries, improvements, and works of authorship, to the Company.",
+        "simplified_text": "The company owns all your work and ideas",
+        "risk_level": "high"
+    },
+    {
+        "clause_type": "liability",
+        "text": "In no event shall the Company be liable for any indirect, incidental, special, consequential, or punitive damages, including but not limited to loss of profits, data, or business opportunities.",
+        "simplified_text": "Company limits its responsibility for damages",
+        "risk_level": "high"
+    },
+    {
+        "clause_type": "termination",
+        "text": "Either party may terminate this Agreement with thirty (30) days written notice to the other party.",
+        "simplified_text": "Either side can end the contract with 30 days notice",
+        "risk_level": "low"
+    },
+    {
+        "clause_type": "payment",
+        "text": "Payment shall be made within thirty (30) days of invoice date. Late payments may incur a service charge of 1.5% per month.",
+        "simplified_text": "Payment due within 30 days, late fees apply",
+        "risk_level": "medium"
+    },
+    {
+        "clause_type": "non_compete",
+        "text": "Employee agrees not to engage in any business activity that competes with the Company's business for a period of two (2) years following termination.",
+        "simplified_text": "Cannot work for competitors for 2 years after leaving",
+        "risk_level": "high"
+    },
+    {
+        "clause_type": "indemnification",
+        "text": "Client shall indemnify and hold harmless the Company from any claims, damages, or expenses arising from Client's use of the services.",
+        "simplified_text": "Client protects company from legal claims",
+        "risk_level": "medium"
+    },
+    {
+        "clause_type": "governing_law",
+        "text": "This Agreement shall be governed by and construed in accordance with the laws of the State of California.",
+        "simplified_text": "California law applies to this contract",
+        "risk_level": "low"
+    },
+    {
+        "clause_type": "dispute_resolution",
+        "text": "Any disputes arising under this Agreement shall be resolved through binding arbitration in accordance with the rules of the American Arbitration Association.",
+        "simplified_text": "Disputes will be settled through arbitration",
+        "risk_level": "medium"
+    },
+    {
+        "clause_type": "force_majeure",
+        "text": "Neither party shall be liable for any failure or delay in performance due to circumstances beyond their reasonable control, including acts of God, war, or government action.",
+        "simplified_text": "Neither side is responsible for delays due to events beyond their control",
+        "risk_level": "low"
+    },
+)
+
+# Set once no load is writing to the clauses collection; dataset routes
+# answer 503 until then so they never serve a half-loaded dataset
+dataset_ready = asyncio.Event()
+# Held by whichever load (startup or reload) is writing to the collection
+dataset_load_lock = asyncio.Lock()
+
 class DatasetLoaderService:
+    # Fixed locations, shared by every instance
+    dataset_url = "https://www.kaggle.com/datasets/mohammedalrashidan/contracts-clauses-datasets/download"
+    data_dir = "data"
+    dataset_file = os.path.join(data_dir, "contracts_clauses_dataset.csv")
+    
     def __init__(self, db):
         self.db = db
-        self.dataset_url = "https://www.kaggle.com/datasets/mohammedalrashidan/contracts-clauses-datasets/download"
-        self.data_dir = "data"
-        self.dataset_file = os.path.join(self.data_dir, "contracts_clauses_dataset.csv")
     
-    async def load_dataset_to_db(self) -> bool:
-        """Load the Kaggle dataset into MongoDB"""
+    @staticmethod
+    def _bulk_load_collection():
+        """Clause collection whose inserts skip the journal wait, for bulk loads"""
+        return Clause.get_motor_collection().with_options(
+            write_concern=WriteConcern(w=1, j=False)
+        )
+    
+    async def load_dataset_to_db(self, force: bool = False) -> bool:
+        """Load the Kaggle dataset into MongoDB (force skips the already-loaded check)"""
         try:
             # Check if dataset is already loaded
-            if await self._is_dataset_loaded():
+            if not force and await self._is_dataset_loaded():
                 logger.info("Dataset already loaded, skipping...")
                 return True
             
@@ -32,8 +125,16 @@ class DatasetLoaderService:
                 logger.error("Failed to download dataset")
                 return False
             
-            # Parse and insert data
-            if not await self._parse_and_insert_data():
+            # Parse and insert data; without a dataset file on disk, insert the
+            # built-in sample
+            if os.path.exists(self.dataset_file):
+                inserted = await self._parse_and_insert_data()
+            else:
+                inserted = await self._insert_sample_directly()
+            
+            if not inserted:
+                # Remove any batches that did land, so the next start reloads
+                await self.clear_dataset()
                 logger.error("Failed to parse and insert dataset")
                 return False
             
@@ -46,8 +147,18 @@ class DatasetLoaderService:
     
     async def _is_dataset_loaded(self) -> bool:
         """Check if dataset is already loaded in database"""
-        count = await Clause.find(Clause.source_dataset == "kaggle_contracts_clauses").count()
-        return count > 0
+        # Existence probe; stops at the first match
+        clause = await Clause.get_motor_collection().find_one(
+            {"source_dataset": "kaggle_contracts_clauses"}, {"_id": 1}
+        )
+        return clause is not None
+    
+    async def clear_dataset(self) -> int:
+        """Delete all dataset clauses server-side in a single command"""
+        result = await Clause.get_motor_collection().delete_many(
+            {"source_dataset": "kaggle_contracts_clauses"}
+        )
+        return result.deleted_count
     
     async def _download_dataset(self) -> bool:
         """Download the dataset from Kaggle"""
@@ -55,108 +166,152 @@ class DatasetLoaderService:
             # Create data directory
             os.makedirs(self.data_dir, exist_ok=True)
             
-            # For now, we'll create a sample dataset since Kaggle requires authentication
-            # In production, you would need to authenticate with Kaggle API
-            logger.info("Creating sample dataset (Kaggle requires authentication)")
-            self._create_sample_dataset()
+            if os.path.exists(self.dataset_file):
+                return True
+            
+            if settings.DATASET_DOWNLOAD_URL:
+                logger.info("Downloading dataset archive")
+                await asyncio.to_thread(self._fetch_dataset, settings.DATASET_DOWNLOAD_URL)
+                return True
+            
+            # Without a download URL, use a sample dataset since Kaggle requires
+            # authentication
+            logger.info("Using sample dataset (Kaggle requires authentication)")
+            if settings.PERSIST_SAMPLE_CSV:
+                await asyncio.to_thread(self._create_sample_dataset)
             return True
             
         except Exception as e:
             logger.error(f"Error downloading dataset: {e}")
             return False
     
+    def _fetch_dataset(self, url: str):
+        """Stream the dataset archive to disk and extract the CSV"""
+        zip_path = os.path.join(self.data_dir, "contracts_clauses_dataset.zip")
+        partial_file = f"{self.dataset_file}.part"
+        
+        try:
+            with requests.get(url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(zip_path, "wb") as f:
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+            
+            with zipfile.ZipFile(zip_path) as archive:
+                member = os.path.basename(self.dataset_file)
+                if member not in archive.namelist():
+                    member = next((name for name in archive.namelist() if name.endswith(".csv")), None)
+                if member is None:
+                    # A StopIteration would escape the worker thread as a broken future
+                    raise ValueError("archive contains no CSV")
+                
+                with archive.open(member) as src, open(partial_file, "wb") as dst:
+                    shutil.copyfileobj(src, dst, length=DOWNLOAD_CHUNK_SIZE)
+            
+            # Only a fully extracted file takes the dataset's place
+            os.replace(partial_file, self.dataset_file)
+            logger.info(f"Dataset downloaded to {self.dataset_file}")
+        finally:
+            for path in (zip_path, partial_file):
+                if os.path.exists(path):
+                    os.remove(path)
+    
     def _create_sample_dataset(self):
-        """Create a sample dataset for testing purposes"""
-        sample_data = [
-            {
-                "clause_type": "confidentiality",
-                "text": "The Company shall maintain strict confidentiality regarding all proprietary information, trade secrets, and confidential data disclosed by the Client during the term of this Agreement.",
-                "simplified_text": "You must keep company information secret",
-                "risk_level": "medium"
-            },
-            {
-                "clause_type": "intellectual_property",
-                "text": "Employee agrees to assign all intellectual property rights, including but not limited to inventions, discoveries, improvements, and works of authorship, to the Company.",
-                "simplified_text": "The company owns all your work and ideas",
-                "risk_level": "high"
-            },
-            {
-                "clause_type": "liability",
-                "text": "In no event shall the Company be liable for any indirect, incidental, special, consequential, or punitive damages, including but not limited to loss of profits, data, or business opportunities.",
-                "simplified_text": "Company limits its responsibility for damages",
-                "risk_level": "high"
-            },
-            {
-                "clause_type": "termination",
-                "text": "Either party may terminate this Agreement with thirty (30) days written notice to the other party.",
-                "simplified_text": "Either side can end the contract with 30 days notice",
-                "risk_level": "low"
-            },
-            {
-                "clause_type": "payment",
-                "text": "Payment shall be made within thirty (30) days of invoice date. Late payments may incur a service charge of 1.5% per month.",
-                "simplified_text": "Payment due within 30 days, late fees apply",
-                "risk_level": "medium"
-            },
-            {
-                "clause_type": "non_compete",
-                "text": "Employee agrees not to engage in any business activity that competes with the Company's business for a period of two (2) years following termination.",
-                "simplified_text": "Cannot work for competitors for 2 years after leaving",
-                "risk_level": "high"
-            },
-            {
-                "clause_type": "indemnification",
-                "text": "Client shall indemnify and hold harmless the Company from any claims, damages, or expenses arising from Client's use of the services.",
-                "simplified_text": "Client protects company from legal claims",
-                "risk_level": "medium"
-            },
-            {
-                "clause_type": "governing_law",
-                "text": "This Agreement shall be governed by and construed in accordance with the laws of the State of California.",
-                "simplified_text": "California law applies to this contract",
-                "risk_level": "low"
-            },
-            {
-                "clause_type": "dispute_resolution",
-                "text": "Any disputes arising under this Agreement shall be resolved through binding arbitration in accordance with the rules of the American Arbitration Association.",
-                "simplified_text": "Disputes will be settled through arbitration",
-                "risk_level": "medium"
-            },
+        """Write the sample dataset to CSV (only when PERSIST_SAMPLE_CSV is set)"""
+        df = pd.DataFrame(_SAMPLE_CLAUSES)
+        df.to_csv(self.dataset_file, index=False)
+        logger.info(f"Sample dataset created at {self.dataset_file}")
+    
+    async def _insert_sample_directly(self) -> bool:
+        """Insert the built-in sample clauses without a CSV round trip"""
+        try:
+            created_at = datetime.now(timezone.utc)
+            records = [
+                {**clause, "source_dataset": "kaggle_contracts_clauses", "created_at": created_at}
+                for clause in _SAMPLE_CLAUSES
+            ]
+            await self._bulk_load_collection().insert_many(records, ordered=False)
+            
+            logger.info(f"Inserted {len(records)} sample clauses into database")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error inserting sample data: {e}")
+            return False
+    
+    def _next_records(self, reader, created_at: datetime) -> Optional[List[Dict[str, Any]]]:
+        """Read the next CSV chunk into insert-ready documents (None when done)"""
+        df = next(reader, None)
+        if df is None:
+            return None
+        
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            raise ValueError(f"dataset is missing required columns: {missing}")
+        
+        # Rows without a clause type or text would fail Clause validation on
+        # read; missing optional values become None rather than NaN
+        df = df.dropna(subset=REQUIRED_COLUMNS).reindex(columns=DATASET_COLUMNS)
+        df = df.astype(object).where(df.notna(), None)
+        
+        return [
             {
-                "clause_type": "force_majeure",
-                "text": "Neither party shall be liable for any failure or delay in performance due to circumstances beyond their reasonable control, including acts of God, war, or government action.",
-                "simplified_text": "Neither side is responsible for delays due to events beyond their control",
-                "risk_level": "low"
+                "clause_type": clause_type,
+                "text": text,
+                "simplified_text": simplified_text,
+                "risk_level": risk_level,
+                "source_dataset": "kaggle_contracts_clauses",
+                "created_at": created_at
             }
+            for clause_type, text, simplified_text, risk_level
+            in df.itertuples(index=False, name=None)
         ]
-        
-        # Save as CSV
-        df = pd.DataFrame(sample_data)
-        df.to_csv(self.dataset_file, index=False)
-        logger.info(f"Sample dataset created at {self.dataset_file}")
     
     async def _parse_and_insert_data(self) -> bool:
-        """Parse CSV and insert data into MongoDB"""
+        """Parse the CSV in INSERT_BATCH_SIZE chunks and insert them into MongoDB"""
         try:
-            # Read CSV file
-            df = pd.read_csv(self.dataset_file)
-            
-            # Insert data into database
-            clauses_to_insert = []
-            for _, row in df.iterrows():
-                clause = Clause(
-                    clause_type=row['clause_type'],
-                    text=row['text'],
-                    simplified_text=row.get('simplified_text'),
-                    risk_level=row.get('risk_level'),
-                    source_dataset="kaggle_contracts_clauses"
-                )
-                clauses_to_insert.append(clause)
-            
-            # Bulk insert
-            await Clause.insert_many(clauses_to_insert)
-            
-            logger.info(f"Inserted {len(clauses_to_insert)} clauses into database")
+            created_at = datetime.now(timezone.utc)
+            collection = self._bulk_load_collection()
+            inserted = 0
+            workers = asyncio.Semaphore(INSERT_WORKERS)
+            inserts = []
+            
+            async def insert_batch(records: List[Dict[str, Any]]):
+                try:
+                    # Unordered, so the server can apply the batch freely
+                    await collection.insert_many(records, ordered=False)
+                finally:
+                    workers.release()
+            
+            # Read CSV file chunk by chunk, parsing off the event loop
+            # Only the known columns are parsed, all as strings
+            reader = await asyncio.to_thread(
+                pd.read_csv,
+                self.dataset_file,
+                chunksize=INSERT_BATCH_SIZE,
+                usecols=lambda column: column in DATASET_COLUMNS,
+                dtype=str
+            )
+            try:
+                with reader:
+                    while (records := await asyncio.to_thread(self._next_records, reader, created_at)) is not None:
+                        if not records:
+                            continue
+                        # Parse the next chunk while earlier ones are still inserting
+                        await workers.acquire()
+                        # Stop at the first failed batch
+                        for task in [task for task in inserts if task.done()]:
+                            inserts.remove(task)
+                            task.result()
+                        inserts.append(asyncio.create_task(insert_batch(records)))
+                        inserted += len(records)
+                await asyncio.gather(*inserts)
+            finally:
+                # Motor runs inserts on executor threads, which cancelling would
+                # not stop; wait for every batch in flight before returning
+                await asyncio.gather(*inserts, return_exceptions=True)
+            
+            logger.info(f"Inserted {inserted} clauses into database")
             return True
             
         except Exception as e:
@@ -181,21 +336,40 @@ class DatasetLoaderService:
             Clause.source_dataset == "kaggle_contracts_clauses"
         ).to_list()
     
-    async def search_clauses(self, search_text: str = None, clause_type: str = None, 
-                      risk_level: str = None, limit: int = 100) -> List[Clause]:
-        """Search clauses with filters"""
-        query = Clause.find(Clause.source_dataset == "kaggle_contracts_clauses")
+    def _search_query(self, search_text: str = None, clause_type: str = None,
+                      risk_level: str = None, after_id: str = None):
+        """Build the filtered clause query shared by search and count"""
+        query_filter: Dict[str, Any] = {"source_dataset": "kaggle_contracts_clauses"}
         
         if search_text:
-            query = query.find({"$text": {"$search": search_text}})
+            query_filter["$text"] = {"$search": search_text}
         
         if clause_type:
-            query = query.find(Clause.clause_type == clause_type)
+            query_filter["clause_type"] = clause_type
         
         if risk_level:
-            query = query.find(Clause.risk_level == risk_level)
+            query_filter["risk_level"] = risk_level
         
-        return await query.limit(limit).to_list()
+        if after_id:
+            query_filter["_id"] = {"$gt": PydanticObjectId(after_id)}
+        
+        return Clause.find(query_filter)
+    
+    async def search_clauses(self, search_text: str = None, clause_type: str = None, 
+                      risk_level: str = None, skip: int = 0, limit: int = 100,
+                      after_id: str = None) -> List[Clause]:
+        """Search clauses with filters, paging by skip or after the after_id clause"""
+        query = self._search_query(search_text, clause_type, risk_level, after_id).sort("+_id")
+        
+        if after_id:
+            return await query.limit(limit).to_list()
+        
+        return await query.skip(skip).limit(limit).to_list()
+    
+    async def count_clauses(self, search_text: str = None, clause_type: str = None,
+                            risk_level: str = None) -> int:
+        """Count clauses matching the same filters as search_clauses"""
+        return await self._search_query(search_text, clause_type, risk_level).count()
     
     async def get_dataset_stats(self) -> Dict[str, Any]:
         """Get dataset statistics"""